@@ -8,13 +8,81 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.figure import Figure
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import numba as nb
+except ImportError:
+    nb = None
+
+# Columns the analysis actually uses - metadata.csv has ~19, we only need 4
+USE_COLUMNS = ['title', 'abstract', 'publish_time', 'journal']
+
+# Arrow-backed dtypes keep strings compact (offsets + buffer instead of
+# boxed Python objects) and dispatch .str/.isna to Arrow kernels
+if pa is not None:
+    try:
+        pd.options.future.infer_string = True
+    except (AttributeError, KeyError):
+        pass
+
+if nb is not None:
+    @nb.njit(parallel=True, cache=True)
+    def _fused_clean_kernel(t_off, t_data, t_valid, a_off, a_data, a_valid,
+                            year, tlen, alen, keep):
+        """One parallel pass over the Arrow buffers: codepoint counts from
+        the string data, presence from the validity bitmaps, year window"""
+        for i in nb.prange(year.shape[0]):
+            # Count codepoints, not bytes: UTF-8 continuation bytes all
+            # match 0b10xxxxxx, so skip those
+            n = 0
+            for j in range(t_off[i], t_off[i + 1]):
+                if (t_data[j] & 0xC0) != 0x80:
+                    n += 1
+            tlen[i] = n
+
+            n = 0
+            for j in range(a_off[i], a_off[i + 1]):
+                if (a_data[j] & 0xC0) != 0x80:
+                    n += 1
+            alen[i] = n
+
+            # Empty validity array means the column has no nulls
+            if t_valid.shape[0] == 0:
+                t_ok = True
+            else:
+                t_ok = ((t_valid[i >> 3] >> (i & 7)) & 1) != 0
+            if a_valid.shape[0] == 0:
+                a_ok = True
+            else:
+                a_ok = ((a_valid[i >> 3] >> (i & 7)) & 1) != 0
+
+            keep[i] = (t_ok or a_ok) and \
+                      (year[i] == -1 or (1990 <= year[i] <= 2024))
+
 class SimpleAnalyzer:
-    def __init__(self, data_path="data/metadata.csv"):
+    def __init__(self, data_path="data/metadata.csv", engine="pandas"):
         self.data_path = data_path
+        self.engine = engine
         self.df = None
-        
+        self._year_counts = None
+        self._journal_counts = None
+
         # Create output directories
         Path("results").mkdir(exist_ok=True)
         Path("results/visualizations").mkdir(exist_ok=True)
@@ -27,94 +95,357 @@ class SimpleAnalyzer:
             print(f"Error: File not found - {self.data_path}")
             return False
         
+        engine = self.engine
+        if engine == 'polars' and pl is None:
+            print("polars not installed, falling back to pandas")
+            engine = 'pandas'
+
         try:
-            self.df = pd.read_csv(self.data_path, nrows=sample_size)
+            header = pd.read_csv(self.data_path, nrows=0)
+            columns = [c for c in USE_COLUMNS if c in header.columns]
+
+            if engine == 'polars':
+                self.df = self._load_polars(sample_size, columns)
+            elif pa is not None:
+                # Parquet cache: convert once, then every later run skips the CSV parse
+                pq_path = Path(self.data_path).with_suffix('.parquet')
+                if not pq_path.exists():
+                    self._convert_to_parquet(pq_path)
+                self.df = self._read_parquet(pq_path, sample_size, columns)
+            else:
+                self.df = self._read_csv_chunked(sample_size, columns)
+
+            # Repeated journal names compress to small integer codes, which
+            # also speeds up every value_counts/nunique downstream
+            if 'journal' in self.df.columns:
+                self.df['journal'] = self.df['journal'].astype('category')
+
+            # Arrow-backed strings make .str.len() run as a vectorized
+            # UTF-8 kernel instead of a per-row Python loop. Columns that
+            # are entirely blank in the CSV come out of the cache
+            # null-typed - cast those too so .str works downstream
+            if pa is not None:
+                for col in ('title', 'abstract'):
+                    if col not in self.df.columns:
+                        continue
+                    dtype = self.df[col].dtype
+                    if not isinstance(dtype, pd.ArrowDtype) or \
+                            pa.types.is_null(dtype.pyarrow_dtype):
+                        self.df[col] = self.df[col].astype('string[pyarrow]')
+
             print(f"Loaded {len(self.df):,} records")
             return True
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
+
+    def _load_polars(self, sample_size, columns):
+        """Lazy Polars pipeline: projection, year/length columns and the
+        year filter all run multithreaded with pushdown before collect"""
+        lf = pl.scan_csv(self.data_path).select(columns)
+
+        if 'publish_time' in columns:
+            lf = lf.with_columns(
+                pl.col('publish_time').str.slice(0, 4)
+                  .cast(pl.Int16, strict=False).alias('year'))
+            lf = lf.filter(pl.col('year').is_between(1990, 2024) |
+                           pl.col('year').is_null())
+        if 'title' in columns:
+            lf = lf.with_columns(
+                pl.col('title').str.len_chars()
+                  .fill_null(0).cast(pl.Int32).alias('title_length'))
+        if 'abstract' in columns:
+            lf = lf.with_columns(
+                pl.col('abstract').str.len_chars()
+                  .fill_null(0).cast(pl.Int32).alias('abstract_length'))
+        if sample_size:
+            lf = lf.head(sample_size)
+
+        # Convert to pandas only at the boundary, for matplotlib
+        return lf.collect().to_pandas(use_pyarrow_extension_array=True)
+
+    def _read_csv_chunked(self, sample_size, columns):
+        """Chunked pandas CSV read - peak memory stays at one chunk"""
+        dtypes = {'journal': 'category'} if 'journal' in columns else None
+
+        chunks = []
+        rows = 0
+        for chunk in pd.read_csv(self.data_path, usecols=columns,
+                                 dtype=dtypes, chunksize=200_000):
+            if sample_size and rows + len(chunk) > sample_size:
+                chunk = chunk.head(sample_size - rows)
+            chunks.append(chunk)
+            rows += len(chunk)
+            if sample_size and rows >= sample_size:
+                break
+
+        return pd.concat(chunks, ignore_index=True)
+
+    def _convert_to_parquet(self, pq_path):
+        """One-time CSV to Parquet conversion (streamed, Snappy-compressed)"""
+        print(f"Building Parquet cache at {pq_path}...")
+        read_options = pv.ReadOptions(block_size=8 << 20)
+        parse_options = pv.ParseOptions(delimiter=',')
+        # Empty fields must become nulls, matching pandas' NaN semantics -
+        # otherwise "" titles/journals survive the empty-record filter and
+        # show up as a real journal in the top-15
+        convert_options = pv.ConvertOptions(strings_can_be_null=True)
+
+        # Write to a temp path and rename only on success, so a failed
+        # conversion can never leave a truncated-but-readable cache that
+        # later runs would silently analyze
+        tmp_path = pq_path.with_name(pq_path.name + '.tmp')
+        writer = None
+        try:
+            with pv.open_csv(self.data_path, read_options=read_options,
+                             parse_options=parse_options,
+                             convert_options=convert_options) as reader:
+                for batch in reader:
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, batch.schema,
+                                                  compression='snappy')
+                    writer.write_batch(batch)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                writer = None
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+
+        os.replace(tmp_path, pq_path)
+
+    def _read_parquet(self, pq_path, sample_size, columns):
+        """Column-projected Parquet read with filters pushed into the scan"""
+        dataset = ds.dataset(pq_path, format='parquet')
+        schema = dataset.schema
+
+        # Push the empty-record predicate into the reader so rows that
+        # would be discarded are never materialized as pandas objects.
+        # The year window stays in clean_data: its NaN semantics (keep
+        # rows whose publish_time has no numeric prefix, e.g. "n.d.")
+        # cannot be mirrored by a plain string-range filter
+        scan_filter = None
+        if 'title' in schema.names and 'abstract' in schema.names:
+            scan_filter = ~(ds.field('title').is_null() &
+                            ds.field('abstract').is_null())
+
+        scanner = dataset.scanner(columns=columns, filter=scan_filter)
+
+        batches = []
+        rows = 0
+        for batch in scanner.to_batches():
+            batches.append(batch)
+            rows += batch.num_rows
+            if sample_size and rows >= sample_size:
+                break
+
+        # Pass the schema explicitly - from_batches alone raises when the
+        # filter eliminated every batch, and an empty result should just
+        # be an empty DataFrame
+        table = pa.Table.from_batches(batches, schema=scanner.projected_schema)
+        df = table.to_pandas(split_blocks=True, self_destruct=True,
+                             types_mapper=pd.ArrowDtype)
+        if sample_size:
+            df = df.head(sample_size)
+        return df
     
     def clean_data(self):
         """Clean dataset"""
         print("Cleaning data...")
         initial_count = len(self.df)
         
-        # Convert dates
-        if 'publish_time' in self.df.columns:
-            self.df['publish_time'] = pd.to_datetime(self.df['publish_time'], errors='coerce')
-            self.df['year'] = self.df['publish_time'].dt.year
-            
+        # Extract years - only the year is used downstream, so a 4-char
+        # slice + numeric cast avoids full datetime parsing
+        need_year_filter = False
+        if 'publish_time' in self.df.columns and 'year' not in self.df.columns:
+            self.df['year'] = pd.to_numeric(
+                self.df['publish_time'].astype('string').str.slice(0, 4),
+                errors='coerce').astype('Int16')
+            need_year_filter = True
+
+        if not self._clean_fused():
             # Filter years
-            self.df = self.df[(self.df['year'] >= 1990) & (self.df['year'] <= 2024) | self.df['year'].isna()]
-        
-        # Calculate text lengths
-        if 'title' in self.df.columns:
-            self.df['title_length'] = self.df['title'].fillna('').str.len()
-        
-        if 'abstract' in self.df.columns:
-            self.df['abstract_length'] = self.df['abstract'].fillna('').str.len()
-        
-        # Remove empty records
-        if 'title' in self.df.columns and 'abstract' in self.df.columns:
-            self.df = self.df[(self.df['title'].notna()) | (self.df['abstract'].notna())]
-        
+            if need_year_filter:
+                self.df = self.df[(self.df['year'] >= 1990) & (self.df['year'] <= 2024) | self.df['year'].isna()]
+
+            # Calculate text lengths - nulls count as 0 without materializing
+            # a fillna('') copy of the column
+            if 'title' in self.df.columns and 'title_length' not in self.df.columns:
+                self.df['title_length'] = self._text_lengths(self.df['title'])
+
+            if 'abstract' in self.df.columns and 'abstract_length' not in self.df.columns:
+                self.df['abstract_length'] = self._text_lengths(self.df['abstract'])
+
+            # Remove empty records - OR the raw null masks and only take the
+            # full-frame copy when the filter actually drops rows
+            if 'title' in self.df.columns and 'abstract' in self.df.columns:
+                mask = self.df['title'].notna().to_numpy() | self.df['abstract'].notna().to_numpy()
+                if not mask.all():
+                    self.df = self.df.loc[mask]
+
+        # Cache the hot reductions once - visualizations and the report
+        # both reuse them instead of re-running value_counts
+        if 'year' in self.df.columns:
+            # Years are bounded small ints after the filter, so a bincount
+            # beats hashing every row and sorting the result
+            years = self.df['year'].dropna().to_numpy().astype('int64')
+            counts = np.bincount(years - 1990, minlength=35)
+            year_counts = pd.Series(counts, index=np.arange(1990, 2025))
+            nonzero = np.flatnonzero(counts)
+            if nonzero.size:
+                year_counts = year_counts.iloc[nonzero[0]:nonzero[-1] + 1]
+            else:
+                year_counts = year_counts.iloc[:0]
+            self._year_counts = year_counts
+        if 'journal' in self.df.columns:
+            # Only the top 15 journals are ever consumed, so partial-select
+            # them with argpartition instead of fully sorting every unique
+            # journal, then sort just those 15 for display
+            vc = self.df['journal'].value_counts(sort=False)
+            k = min(15, len(vc))
+            if k:
+                top_idx = np.argpartition(-vc.to_numpy(), k - 1)[:k]
+                self._journal_counts = vc.iloc[top_idx].sort_values(ascending=False)
+            else:
+                self._journal_counts = vc
+
         print(f"Cleaned dataset: {len(self.df):,} records ({initial_count - len(self.df):,} removed)")
     
+    def _clean_fused(self):
+        """Run the clean_data per-row work as one parallel Numba kernel
+        over the raw Arrow buffers; returns False when that does not apply
+        (no numba, non-Arrow columns, or lengths already computed)"""
+        if nb is None or pa is None:
+            return False
+        if any(c not in self.df.columns for c in ('title', 'abstract', 'year')):
+            return False
+        if 'title_length' in self.df.columns or 'abstract_length' in self.df.columns:
+            return False
+
+        buffers = []
+        for col in ('title', 'abstract'):
+            if not isinstance(self.df[col].dtype, pd.ArrowDtype):
+                return False
+            arr = self.df[col].array._pa_array.combine_chunks()
+            if arr.offset != 0 or not (pa.types.is_string(arr.type) or
+                                       pa.types.is_large_string(arr.type)):
+                return False
+            offset_dtype = np.int64 if pa.types.is_large_string(arr.type) else np.int32
+            offsets = np.frombuffer(arr.buffers()[1], dtype=offset_dtype)[:len(arr) + 1]
+            if arr.buffers()[2] is not None:
+                data = np.frombuffer(arr.buffers()[2], dtype=np.uint8)
+            else:
+                data = np.empty(0, dtype=np.uint8)
+            if arr.null_count and arr.buffers()[0] is not None:
+                validity = np.frombuffer(arr.buffers()[0], dtype=np.uint8)
+            else:
+                validity = np.empty(0, dtype=np.uint8)
+            buffers.append((offsets, data, validity))
+
+        year = self.df['year'].to_numpy(dtype='int32', na_value=-1)
+        tlen = np.empty(len(year), dtype=np.int32)
+        alen = np.empty(len(year), dtype=np.int32)
+        keep = np.empty(len(year), dtype=np.bool_)
+
+        (t_off, t_data, t_valid), (a_off, a_data, a_valid) = buffers
+        _fused_clean_kernel(t_off, t_data, t_valid, a_off, a_data, a_valid,
+                            year, tlen, alen, keep)
+
+        self.df['title_length'] = tlen
+        self.df['abstract_length'] = alen
+        if not keep.all():
+            self.df = self.df.loc[keep]
+        return True
+
+    def _text_lengths(self, col):
+        """Character counts with nulls as 0"""
+        if col.dtype == object and hasattr(np, 'strings'):
+            # Plain object column (no Arrow): numpy's string kernel beats
+            # the per-row Python loop that .str.len() takes here
+            arr = col.fillna('').to_numpy().astype(np.dtypes.StringDType())
+            return np.strings.str_len(arr).astype('int32')
+        if not (col.dtype == object or pd.api.types.is_string_dtype(col)):
+            # An entirely blank column parses as all-NaN floats, where
+            # .str would raise - every length is 0
+            return np.zeros(len(col), dtype=np.int32)
+        return col.str.len().fillna(0).astype('int32')
+
     def create_visualizations(self):
         """Create analysis visualizations"""
         print("Creating visualizations...")
         
         plt.style.use('default')
-        
+        plt.ioff()  # headless run, skip interactive GUI callbacks
+
+        # Build standalone Figure objects (no pyplot global state) so the
+        # PNG encodes can run concurrently afterwards
+        figures = []
+
         # 1. Publications by year
-        if 'year' in self.df.columns:
-            year_counts = self.df['year'].value_counts().sort_index()
-            
-            plt.figure(figsize=(10, 6))
-            year_counts.plot(kind='bar', color='steelblue')
-            plt.title('Publications by Year')
-            plt.xlabel('Year')
-            plt.ylabel('Number of Publications')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig('results/visualizations/publication_trends.png', dpi=300, bbox_inches='tight')
-            plt.close()
-        
+        if self._year_counts is not None:
+            year_counts = self._year_counts
+
+            fig = Figure(figsize=(10, 6), layout='constrained')
+            ax = fig.subplots()
+            ax.bar(year_counts.index, year_counts.to_numpy(), color='steelblue')
+            ax.set_title('Publications by Year')
+            ax.set_xlabel('Year')
+            ax.set_ylabel('Number of Publications')
+            ax.tick_params(axis='x', rotation=45)
+            figures.append((fig, 'results/visualizations/publication_trends.png'))
+
         # 2. Top journals
-        if 'journal' in self.df.columns:
-            journal_counts = self.df['journal'].value_counts().head(15)
-            
-            plt.figure(figsize=(12, 8))
-            journal_counts.plot(kind='barh', color='coral')
-            plt.title('Top 15 Journals')
-            plt.xlabel('Number of Publications')
-            plt.tight_layout()
-            plt.savefig('results/visualizations/top_journals.png', dpi=300, bbox_inches='tight')
-            plt.close()
-        
+        if self._journal_counts is not None:
+            journal_counts = self._journal_counts.head(15)
+
+            fig = Figure(figsize=(12, 8), layout='constrained')
+            ax = fig.subplots()
+            ax.barh(journal_counts.index.astype(str), journal_counts.to_numpy(),
+                    color='coral')
+            ax.set_title('Top 15 Journals')
+            ax.set_xlabel('Number of Publications')
+            figures.append((fig, 'results/visualizations/top_journals.png'))
+
         # 3. Text analysis
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-        
+        fig = Figure(figsize=(14, 6), layout='constrained')
+        axes = fig.subplots(1, 2)
+
         if 'title_length' in self.df.columns:
-            self.df['title_length'][self.df['title_length'] > 0].hist(bins=30, ax=axes[0], alpha=0.7)
-            axes[0].set_title('Title Length Distribution')
-            axes[0].set_xlabel('Characters')
-            axes[0].set_ylabel('Frequency')
-        
+            self._length_histogram(axes[0], self.df['title_length'],
+                                   'Title Length Distribution')
+
         if 'abstract_length' in self.df.columns:
-            abstract_lengths = self.df['abstract_length'][self.df['abstract_length'] > 0]
-            abstract_lengths.hist(bins=30, ax=axes[1], alpha=0.7)
-            axes[1].set_title('Abstract Length Distribution')
-            axes[1].set_xlabel('Characters')
-            axes[1].set_ylabel('Frequency')
-        
-        plt.tight_layout()
-        plt.savefig('results/visualizations/text_analysis_overview.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
+            self._length_histogram(axes[1], self.df['abstract_length'],
+                                   'Abstract Length Distribution')
+
+        figures.append((fig, 'results/visualizations/text_analysis_overview.png'))
+
+        # PNG compression releases the GIL, so the saves overlap
+        with ThreadPoolExecutor(max_workers=len(figures)) as executor:
+            list(executor.map(
+                lambda pair: pair[0].savefig(pair[1], dpi=300, bbox_inches='tight'),
+                figures))
+
         print("Visualizations saved to results/visualizations/")
     
+    def _length_histogram(self, ax, lengths, title):
+        """Bar plot from precomputed numpy bins - skips the pandas plotting
+        accessor and clips the long tail in one vectorized pass"""
+        arr = lengths.to_numpy()
+        arr = arr[arr > 0]
+        if arr.size == 0:
+            return
+
+        upper = max(float(np.quantile(arr, 0.999)), 2.0)
+        counts, edges = np.histogram(arr, bins=30, range=(1, upper))
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7)
+        ax.set_title(title)
+        ax.set_xlabel('Characters')
+        ax.set_ylabel('Frequency')
+
     def generate_report(self):
         """Generate analysis report"""
         print("Generating report...")
@@ -128,34 +459,39 @@ class SimpleAnalyzer:
         report.append("Dataset Overview:")
         report.append(f"- Total records: {len(self.df):,}")
         
-        if 'year' in self.df.columns:
-            year_counts = self.df['year'].value_counts().sort_index()
+        # Empty series happen when every row was filtered out - skip the
+        # stats that need at least one year/journal
+        has_years = self._year_counts is not None and len(self._year_counts) > 0
+        has_journals = self._journal_counts is not None and len(self._journal_counts) > 0
+
+        if has_years:
+            year_counts = self._year_counts
             peak_year = year_counts.idxmax()
-            report.append(f"- Year range: {self.df['year'].min():.0f} - {self.df['year'].max():.0f}")
+            report.append(f"- Year range: {year_counts.index.min():.0f} - {year_counts.index.max():.0f}")
             report.append(f"- Peak year: {peak_year} ({year_counts.max():,} papers)")
-        
-        if 'journal' in self.df.columns:
-            top_journal = self.df['journal'].value_counts().index[0]
-            top_count = self.df['journal'].value_counts().iloc[0]
+
+        if has_journals:
+            top_journal = self._journal_counts.index[0]
+            top_count = self._journal_counts.iloc[0]
             report.append(f"- Top journal: {top_journal} ({top_count:,} papers)")
             report.append(f"- Unique journals: {self.df['journal'].nunique():,}")
         
-        if 'title_length' in self.df.columns:
+        if 'title_length' in self.df.columns and len(self.df):
             avg_title = self.df['title_length'].mean()
             report.append(f"- Average title length: {avg_title:.1f} characters")
         
-        if 'abstract_length' in self.df.columns:
+        if 'abstract_length' in self.df.columns and len(self.df):
             avg_abstract = self.df['abstract_length'].mean()
             report.append(f"- Average abstract length: {avg_abstract:.1f} characters")
         
         report.append("")
         report.append("Key Insights:")
         
-        if 'year' in self.df.columns and peak_year >= 2020:
+        if has_years and peak_year >= 2020:
             report.append("- COVID-19 pandemic led to surge in research publications")
-        
-        if 'journal' in self.df.columns:
-            concentration = self.df['journal'].value_counts().head(10).sum() / len(self.df) * 100
+
+        if has_journals:
+            concentration = self._journal_counts.head(10).sum() / len(self.df) * 100
             report.append(f"- Top 10 journals publish {concentration:.1f}% of all papers")
         
         # Save report
@@ -163,6 +499,25 @@ class SimpleAnalyzer:
         with open("results/analysis_report.txt", "w") as f:
             f.write(report_text)
         
+        # Tiny pre-aggregated summary (a few KB) so the Streamlit app can
+        # draw interactive charts without re-running the pipeline
+        if pa is not None:
+            frames = []
+            if self._year_counts is not None:
+                frames.append(pd.DataFrame({
+                    'kind': 'year',
+                    'label': self._year_counts.index.astype(str),
+                    'count': self._year_counts.to_numpy()}))
+            if self._journal_counts is not None:
+                top = self._journal_counts.head(15)
+                frames.append(pd.DataFrame({
+                    'kind': 'journal',
+                    'label': top.index.astype(str),
+                    'count': top.to_numpy()}))
+            if frames:
+                pd.concat(frames, ignore_index=True).to_parquet(
+                    'results/summary.parquet', index=False)
+
         print(report_text)
         print("\nReport saved to results/analysis_report.txt")
     
@@ -5,6 +5,7 @@ Simple version with clean interface and minimal code
 
 import streamlit as st
 import pandas as pd
+import pyarrow.csv as pv
 import matplotlib.pyplot as plt
 import plotly.express as px
 import os
@@ -12,52 +13,128 @@ from pathlib import Path
 
 st.set_page_config(page_title="CORD-19 Analysis", layout="wide")
 
-def load_analysis_results():
-    """Load pre-generated results from analysis.py"""
+VIZ_FILES = ['publication_trends.png', 'top_journals.png', 'text_analysis_overview.png']
+
+def _results_mtimes():
+    """Modification times of the pre-generated result files (None if missing)"""
+    report_path = Path("results/analysis_report.txt")
+    report_mtime = report_path.stat().st_mtime if report_path.exists() else None
+
+    viz_dir = Path("results/visualizations")
+    viz_mtimes = tuple(
+        (viz_dir / name).stat().st_mtime if (viz_dir / name).exists() else None
+        for name in VIZ_FILES)
+
+    return report_mtime, viz_mtimes
+
+@st.cache_data
+def load_analysis_results(report_mtime, viz_mtimes):
+    """Load pre-generated results from analysis.py
+
+    The mtime arguments are cache keys: Streamlit reruns this on every
+    widget interaction, so cache until the files actually change."""
     results = {}
-    
+
     # Check for report
     report_path = Path("results/analysis_report.txt")
-    results['has_report'] = report_path.exists()
+    results['has_report'] = report_mtime is not None
     if results['has_report']:
         results['report'] = report_path.read_text()
-    
+
     # Check for visualizations
-    viz_dir = Path("results/visualizations")
-    results['visualizations'] = {}
-    if viz_dir.exists():
-        for viz_file in ['publication_trends.png', 'top_journals.png', 'text_analysis_overview.png']:
-            results['visualizations'][viz_file] = (viz_dir / viz_file).exists()
-    
+    results['visualizations'] = dict(zip(VIZ_FILES,
+                                         (m is not None for m in viz_mtimes)))
+
     return results
 
+# Columns the dashboard actually displays or aggregates
+APP_COLUMNS = ['cord_uid', 'title', 'abstract', 'publish_time', 'journal']
+
+@st.cache_data
+def load_summary(summary_mtime):
+    """Tiny pre-aggregated counts written by analysis.py"""
+    return pd.read_parquet("results/summary.parquet")
+
 @st.cache_data
 def load_data(uploaded_file, sample_size=None):
     """Load CSV data"""
     try:
+        # The upload is already an in-memory buffer, so feed it straight
+        # to pyarrow's multithreaded CSV parser instead of pandas'
+        # single-threaded one, keeping only the columns we use
+        # strings_can_be_null keeps pandas' NaN semantics: empty
+        # journal/title/abstract fields must not count as real values
+        # in nunique/value_counts
+        try:
+            table = pv.read_csv(
+                uploaded_file,
+                read_options=pv.ReadOptions(use_threads=True),
+                convert_options=pv.ConvertOptions(include_columns=APP_COLUMNS,
+                                                  strings_can_be_null=True))
+        except KeyError:
+            # Upload lacks some of our columns - parse everything and
+            # project afterwards
+            uploaded_file.seek(0)
+            table = pv.read_csv(
+                uploaded_file,
+                convert_options=pv.ConvertOptions(strings_can_be_null=True))
+            table = table.select([c for c in APP_COLUMNS
+                                  if c in table.column_names])
+
         if sample_size:
-            return pd.read_csv(uploaded_file, nrows=sample_size)
-        return pd.read_csv(uploaded_file)
+            table = table.slice(0, sample_size)
+
+        df = table.to_pandas(split_blocks=True, self_destruct=True,
+                             types_mapper=pd.ArrowDtype)
+
+        # Entirely blank columns parse as null type, where fillna/.str
+        # raise downstream - cast them to string
+        for col in df.columns:
+            if str(df[col].dtype) == 'null[pyarrow]':
+                df[col] = df[col].astype('string[pyarrow]')
+
+        if 'journal' in df.columns:
+            df['journal'] = df['journal'].astype('category')
+        return df
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
-def preprocess_data(df):
+def preprocess_data(df, full_dates=False):
     """Basic data preprocessing"""
-    df = df.copy()
-    
+    extras = {}
+
     if 'publish_time' in df.columns:
-        df['publish_time'] = pd.to_datetime(df['publish_time'], errors='coerce')
-        df['year'] = df['publish_time'].dt.year
-        # Filter reasonable years
-        df = df[(df['year'] >= 1990) & (df['year'] <= 2024) | df['year'].isna()]
-    
+        if full_dates:
+            # Full datetime parse, only needed when month/day matter
+            publish = pd.to_datetime(df['publish_time'], errors='coerce')
+            extras['publish_time'] = publish
+            extras['year'] = publish.dt.year
+        else:
+            # Only the year is used, so slice the first 4 chars instead of
+            # paying for full datetime parsing
+            extras['year'] = pd.to_numeric(
+                df['publish_time'].astype('string').str.slice(0, 4),
+                errors='coerce').astype('Int16')
+
     if 'title' in df.columns:
-        df['title_length'] = df['title'].fillna('').str.len()
-    
+        extras['title_length'] = df['title'].fillna('').str.len()
+
     if 'abstract' in df.columns:
-        df['abstract_length'] = df['abstract'].fillna('').str.len()
-    
+        extras['abstract_length'] = df['abstract'].fillna('').str.len()
+
+    # One concat of the derived columns instead of df.copy() plus
+    # per-column inserts
+    if extras:
+        extras_df = pd.DataFrame(extras, index=df.index)
+        overlap = [c for c in extras_df.columns if c in df.columns]
+        df = pd.concat([df.drop(columns=overlap), extras_df], axis=1)
+
+    # Filter reasonable years in a single fancy-indexing pass
+    if 'year' in df.columns:
+        mask = df['year'].between(1990, 2024) | df['year'].isna()
+        df = df.loc[mask]
+
     return df
 
 def create_publication_chart(df):
@@ -94,7 +171,7 @@ def main():
     st.write("Analysis dashboard for COVID-19 research publications")
     
     # Load pre-generated results
-    results = load_analysis_results()
+    results = load_analysis_results(*_results_mtimes())
     
     # Tabs for different views
     tab1, tab2 = st.tabs(["Pre-Generated Results", "Live Analysis"])
@@ -104,15 +181,36 @@ def main():
         
         if results['has_report']:
             st.success("Analysis results available")
-            
-            # Show visualizations
-            viz_dir = Path("results/visualizations")
-            for viz_name, available in results['visualizations'].items():
-                if available:
-                    viz_path = viz_dir / viz_name
-                    st.subheader(viz_name.replace('_', ' ').replace('.png', '').title())
-                    st.image(str(viz_path))
-            
+
+            # Interactive charts from the pre-aggregated summary when
+            # available (a tiny parquet read), otherwise the static PNGs
+            summary_path = Path("results/summary.parquet")
+            if summary_path.exists():
+                summary = load_summary(summary_path.stat().st_mtime)
+
+                year_counts = summary[summary['kind'] == 'year']
+                if len(year_counts):
+                    fig = px.line(x=year_counts['label'], y=year_counts['count'],
+                                  title="Publications by Year",
+                                  labels={'x': 'Year', 'y': 'Publications'})
+                    st.plotly_chart(fig, use_container_width=True)
+
+                journal_counts = summary[summary['kind'] == 'journal']
+                if len(journal_counts):
+                    fig = px.bar(x=journal_counts['count'], y=journal_counts['label'],
+                                 orientation='h', title="Top Journals",
+                                 labels={'x': 'Publications', 'y': 'Journal'})
+                    fig.update_layout(height=500)
+                    st.plotly_chart(fig, use_container_width=True)
+            else:
+                # Show visualizations
+                viz_dir = Path("results/visualizations")
+                for viz_name, available in results['visualizations'].items():
+                    if available:
+                        viz_path = viz_dir / viz_name
+                        st.subheader(viz_name.replace('_', ' ').replace('.png', '').title())
+                        st.image(str(viz_path))
+
             # Show report in expandable section
             with st.expander("View Analysis Report"):
                 st.text(results['report'])